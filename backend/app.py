@@ -1,7 +1,10 @@
 # backend/app.py
 import os
+import time
 import traceback
-from flask import Flask, jsonify, send_from_directory
+import orjson
+from flask import Flask, Response, jsonify, send_from_directory
+from flask_compress import Compress
 from flask_cors import CORS
 from confluence import get_confluence
 
@@ -16,22 +19,46 @@ app = Flask(
 
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+# The confluence payload is mostly repeated label strings and compresses
+# very well; skip bodies too small to be worth the gzip overhead
+app.config["COMPRESS_MIN_SIZE"] = 500
+Compress(app)
+
+# Successive hits inside the TTL return the previously serialized body
+# instead of recomputing all pairs (the underlying data only changes on
+# the fetch-cache cadence anyway)
+CONFLUENCE_RESPONSE_TTL = 60
+_LAST_RESPONSE = {"t": 0.0, "body": None}
+
+def _json_response(body):
+    return Response(body, mimetype="application/json",
+                    headers={"Cache-Control": f"max-age={CONFLUENCE_RESPONSE_TTL}"})
+
 @app.route("/confluence")
 def confluence_route():
     try:
+        if (_LAST_RESPONSE["body"] is not None
+                and time.monotonic() - _LAST_RESPONSE["t"] < CONFLUENCE_RESPONSE_TTL):
+            return _json_response(_LAST_RESPONSE["body"])
+
         print("Fetching confluence data...")
         data = get_confluence()
-        
+
         if not data:
             print("No data returned from get_confluence()")
             return jsonify({
                 "error": "No confluence data returned",
                 "data": []
             }), 500
-        
+
         print(f"Successfully fetched {len(data)} pairs")
-        return jsonify(data)
-        
+        # orjson emits bytes directly and handles numpy scalars natively,
+        # so nothing in the payload needs casting first
+        body = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        _LAST_RESPONSE["body"] = body
+        _LAST_RESPONSE["t"] = time.monotonic()
+        return _json_response(body)
+
     except Exception as e:
         print(f"ERROR in /confluence: {str(e)}")
         traceback.print_exc()
@@ -9,109 +9,248 @@ Uses Alpha Vantage API with smart rate limiting for free tier:
 
 import os
 import logging
+import threading
 import time
 import requests
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
 
 import numpy as np
+import orjson
 import pandas as pd
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from indicators import analyze_tf, _ema_last
 
 # Get API key from environment
 ALPHAVANTAGE_API_KEY = os.environ.get("ALPHAVANTAGE_API_KEY", "")
 
+# Resolve the key check to one module-level flag so an unconfigured
+# deployment complains once at start-up instead of once per doomed fetch
+_HAS_KEY = bool(ALPHAVANTAGE_API_KEY)
+
+# Concurrent fetch workers - requests.get releases the GIL during socket
+# waits, so overlapping timeframe fetches is nearly free; the rate limiter
+# still serializes actual API hits
+FETCH_WORKERS = 4
+
+# Shared HTTP session - reuses keep-alive connections so we don't pay a
+# fresh TCP+TLS handshake on every API call, and retries transient errors.
+# The pool is sized to the fetch fan-out so no worker ever has to open a
+# throwaway connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=2 * FETCH_WORKERS,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
 # Logging
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("confluence")
 
-# Forex pairs
-PAIRS = [
-    {"Pair": "EUR/USD", "Symbol": "EURUSD"},
-    {"Pair": "GBP/USD", "Symbol": "GBPUSD"},
-    {"Pair": "USD/JPY", "Symbol": "USDJPY"},
-    {"Pair": "USD/CHF", "Symbol": "USDCHF"},
-    {"Pair": "AUD/USD", "Symbol": "AUDUSD"},
-    {"Pair": "NZD/USD", "Symbol": "NZDUSD"},
-    {"Pair": "USD/CAD", "Symbol": "USDCAD"},
-    {"Pair": "EUR/GBP", "Symbol": "EURGBP"},
-    {"Pair": "EUR/JPY", "Symbol": "EURJPY"},
-    {"Pair": "GBP/JPY", "Symbol": "GBPJPY"},
-    {"Pair": "AUD/JPY", "Symbol": "AUDJPY"},
-    {"Pair": "AUD/NZD", "Symbol": "AUDNZD"},
-    {"Pair": "CHF/JPY", "Symbol": "CHFJPY"},
-]
+if not _HAS_KEY:
+    log.error("ALPHAVANTAGE_API_KEY not set - API fetches will be skipped "
+              "(cached frames are still served)")
+
+# Forex pairs - immutable NamedTuples: attribute access beats per-loop
+# dict lookups and nothing can mutate the universe at runtime.
+# From/To are precomputed so no per-request string slicing.
+class Pair(NamedTuple):
+    pair: str
+    symbol: str
+    from_sym: str
+    to_sym: str
+
+PAIRS = (
+    Pair("EUR/USD", "EURUSD", "EUR", "USD"),
+    Pair("GBP/USD", "GBPUSD", "GBP", "USD"),
+    Pair("USD/JPY", "USDJPY", "USD", "JPY"),
+    Pair("USD/CHF", "USDCHF", "USD", "CHF"),
+    Pair("AUD/USD", "AUDUSD", "AUD", "USD"),
+    Pair("NZD/USD", "NZDUSD", "NZD", "USD"),
+    Pair("USD/CAD", "USDCAD", "USD", "CAD"),
+    Pair("EUR/GBP", "EURGBP", "EUR", "GBP"),
+    Pair("EUR/JPY", "EURJPY", "EUR", "JPY"),
+    Pair("GBP/JPY", "GBPJPY", "GBP", "JPY"),
+    Pair("AUD/JPY", "AUDJPY", "AUD", "JPY"),
+    Pair("AUD/NZD", "AUDNZD", "AUD", "NZD"),
+    Pair("CHF/JPY", "CHFJPY", "CHF", "JPY"),
+)
 
 # Timeframes - Alpha Vantage only supports daily, weekly, monthly
 TF_SETTINGS = {
-    "Weekly": {"function": "FX_WEEKLY", "interval": None},
-    "Daily": {"function": "FX_DAILY", "interval": None},
+    "Weekly": {"function": "FX_WEEKLY", "interval": None, "ema_period": 200},
+    "Daily": {"function": "FX_DAILY", "interval": None, "ema_period": 200},
 }
 
-# Cache - 30 minutes to save API calls
-CACHE: Dict[Tuple[str, str], Tuple[float, Optional[pd.DataFrame]]] = {}
-CACHE_TTL = 1800  # 30 minutes
+# PAIRS and TF_SETTINGS never change at runtime, so flatten the fetch
+# fan-out into a static plan once instead of rebuilding the nested
+# comprehension (and its dict lookups) on every refresh
+_FETCH_PLAN = tuple(
+    (p.symbol, tf, settings["function"], p.from_sym, p.to_sym)
+    for p in PAIRS
+    for tf, settings in TF_SETTINGS.items()
+)
+
+# Cache to save API calls. TTLCache evicts expired/excess entries so a
+# long-lived server process can't accumulate stale frames, and never
+# serves data older than the TTL. Weekly bars only change once a week,
+# so they get a much longer TTL than daily bars - one cache per function
+# because cachetools fixes the TTL per cache.
+CACHE_TTL = 1800  # 30 minutes (daily default)
+CACHE_TTLS = {
+    "FX_DAILY": CACHE_TTL,
+    "FX_WEEKLY": 6 * 3600,
+}
+CACHES: Dict[str, TTLCache] = {
+    function: TTLCache(maxsize=32, ttl=ttl)
+    for function, ttl in CACHE_TTLS.items()
+}
+_CACHE_LOCK = threading.RLock()
+
+# On-disk cache layer under the in-memory one, so worker restarts (or
+# gunicorn's multiple processes) don't each burn API quota re-fetching
+# the same frames. Pickle keeps us off extra parquet dependencies.
+DISK_CACHE_DIR = os.environ.get("AV_CACHE_DIR", "/tmp/fx-av-cache")
+
+# Negative cache - a (symbol, function) fetch that just failed (API
+# limit, error payload, network trouble) will almost certainly fail again
+# right away, so short-circuit retries instead of burning quota and
+# rate-limiter sleeps on doomed requests
+NEG_CACHE_TTL = 300  # 5 minutes
+_NEG_CACHE: Dict[Tuple[str, str], float] = {}
 
 # Rate limiting
 LAST_REQUEST_TIME = 0
 MIN_REQUEST_INTERVAL = 13  # 13 seconds between requests = ~4.6 per minute (safe for 5/min limit)
+_RATE_LOCK = threading.Lock()
+
+# Only the tail of the history is needed (200 EMA + ATR14 + structure lookback),
+# so don't bother building a DataFrame for the full multi-year series
+MAX_ROWS = 260
+
+# Warm the EMA weight cache for the standard (span, length) shape at
+# import so the first request doesn't build the decay vector on the
+# latency path
+for _settings in TF_SETTINGS.values():
+    _ema_last(np.zeros(MAX_ROWS, dtype=np.float32), _settings["ema_period"])
+del _settings
+
+# Fixed request params built once; per-call copies only fill in the
+# function and currency halves
+_PARAMS_TEMPLATE = {
+    "apikey": ALPHAVANTAGE_API_KEY,
+    "outputsize": "full",
+}
 
 def _rate_limit():
-    """Ensure we don't exceed 5 API calls per minute"""
+    """Ensure we don't exceed 5 API calls per minute (thread-safe)"""
     global LAST_REQUEST_TIME
-    now = time.time()
-    time_since_last = now - LAST_REQUEST_TIME
-    if time_since_last < MIN_REQUEST_INTERVAL:
-        sleep_time = MIN_REQUEST_INTERVAL - time_since_last
-        log.info(f"Rate limiting: sleeping {sleep_time:.1f}s")
-        time.sleep(sleep_time)
-    LAST_REQUEST_TIME = time.time()
-
-def _fetch_alphavantage(symbol: str, function: str) -> Optional[pd.DataFrame]:
+    with _RATE_LOCK:
+        now = time.time()
+        time_since_last = now - LAST_REQUEST_TIME
+        if time_since_last < MIN_REQUEST_INTERVAL:
+            sleep_time = MIN_REQUEST_INTERVAL - time_since_last
+            log.info(f"Rate limiting: sleeping {sleep_time:.1f}s")
+            time.sleep(sleep_time)
+        LAST_REQUEST_TIME = time.time()
+
+def _neg_mark(key: Tuple[str, str]) -> None:
+    """Remember a failed fetch so retries back off for NEG_CACHE_TTL"""
+    _NEG_CACHE[key] = time.time() + NEG_CACHE_TTL
+
+def _disk_cache_path(symbol: str, function: str) -> str:
+    return os.path.join(DISK_CACHE_DIR, f"{symbol}_{function}.pkl")
+
+def _disk_cache_get(symbol: str, function: str) -> Optional[pd.DataFrame]:
+    """Return a frame from disk if it's younger than the cache TTL"""
+    path = _disk_cache_path(symbol, function)
+    try:
+        if time.time() - os.path.getmtime(path) < CACHE_TTLS.get(function, CACHE_TTL):
+            return pd.read_pickle(path)
+    except OSError:
+        pass
+    except Exception:
+        log.warning(f"Could not read disk cache for {symbol} {function}")
+    return None
+
+def _disk_cache_put(symbol: str, function: str, df: pd.DataFrame) -> None:
+    try:
+        os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+        df.to_pickle(_disk_cache_path(symbol, function))
+    except Exception:
+        log.warning(f"Could not write disk cache for {symbol} {function}")
+
+def _fetch_alphavantage(symbol: str, function: str,
+                        from_sym: str, to_sym: str) -> Optional[pd.DataFrame]:
     """Fetch data from Alpha Vantage API"""
     key = (symbol, function)
-    now = time.time()
-    
-    # Check cache
-    cached = CACHE.get(key)
-    if cached:
-        ts, df = cached
-        if now - ts < CACHE_TTL:
+    cache = CACHES.get(function)
+
+    # Check cache - TTLCache handles expiry itself
+    if cache is not None:
+        with _CACHE_LOCK:
+            df = cache.get(symbol)
+        if df is not None:
             log.info(f"CACHE HIT {symbol} {function}")
             return df
-    
-    if not ALPHAVANTAGE_API_KEY:
-        log.error("ALPHAVANTAGE_API_KEY not set!")
+
+    # Fall back to the on-disk layer before paying for an API call
+    df = _disk_cache_get(symbol, function)
+    if df is not None:
+        log.info(f"DISK CACHE HIT {symbol} {function}")
+        if cache is not None:
+            with _CACHE_LOCK:
+                cache[symbol] = df
+        return df
+
+    # Keyless fail-fast: the caches above still serve, but there is no
+    # point entering the rate-limited network path
+    if not _HAS_KEY:
+        return None
+
+    if _NEG_CACHE.get(key, 0) > time.time():
+        log.info(f"NEGATIVE CACHE HIT {symbol} {function} - skipping retry")
         return None
-    
+
     try:
         # Rate limit
         _rate_limit()
         
         url = "https://www.alphavantage.co/query"
-        params = {
-            "function": function,
-            "from_symbol": symbol[:3],
-            "to_symbol": symbol[3:],
-            "apikey": ALPHAVANTAGE_API_KEY,
-            "outputsize": "full"
-        }
+        params = _PARAMS_TEMPLATE.copy()
+        params["function"] = function
+        params["from_symbol"] = from_sym
+        params["to_symbol"] = to_sym
         
         log.info(f"Fetching {symbol} {function}")
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         
         if response.status_code != 200:
             log.error(f"API error {response.status_code}")
+            _neg_mark(key)
             return None
         
-        data = response.json()
+        # orjson parses the payload several times faster than requests'
+        # stdlib json path and skips the intermediate str decode
+        data = orjson.loads(response.content)
         
         # Check for API limit message
         if "Note" in data:
             log.error(f"API limit hit: {data['Note']}")
+            _neg_mark(key)
             return None
         
         if "Error Message" in data:
             log.error(f"API error: {data['Error Message']}")
+            _neg_mark(key)
             return None
         
         # Get time series data
@@ -125,224 +264,68 @@ def _fetch_alphavantage(symbol: str, function: str) -> Optional[pd.DataFrame]:
         
         if time_series_key not in data:
             log.error(f"No {time_series_key} in response")
+            _neg_mark(key)
             return None
         
         time_series = data[time_series_key]
         
         if not time_series:
             log.warning(f"Empty time series for {symbol} {function}")
+            _neg_mark(key)
             return None
         
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(time_series, orient='index')
-        
+        # Keep only the trailing rows - dates sort lexicographically, so the
+        # tail of the sorted items is the most recent data
+        items = sorted(time_series.items())[-MAX_ROWS:]
+        n = len(items)
+
+        # Parse straight into typed arrays; building the DataFrame from
+        # these skips pandas' dtype inference and the rename/astype passes.
+        # float32 halves what the caches hold and what the indicators read,
+        # and FX quotes nowhere near exhaust its precision
+        opens = np.empty(n, dtype=np.float32)
+        highs = np.empty(n, dtype=np.float32)
+        lows = np.empty(n, dtype=np.float32)
+        closes = np.empty(n, dtype=np.float32)
+        dates = np.empty(n, dtype="datetime64[ns]")
+        for i, (date_str, row) in enumerate(items):
+            dates[i] = np.datetime64(date_str)
+            opens[i] = float(row["1. open"])
+            highs[i] = float(row["2. high"])
+            lows[i] = float(row["3. low"])
+            closes[i] = float(row["4. close"])
+
+        df = pd.DataFrame(
+            {"Open": opens, "High": highs, "Low": lows, "Close": closes},
+            index=pd.DatetimeIndex(dates)
+        )
+
         if df.empty:
             return None
         
-        # Convert index to datetime
-        df.index = pd.to_datetime(df.index)
-        df = df.sort_index()
-        
-        # Rename columns
-        df = df.rename(columns={
-            '1. open': 'Open',
-            '2. high': 'High',
-            '3. low': 'Low',
-            '4. close': 'Close'
-        })
-        
-        # Convert to numeric
-        for col in ['Open', 'High', 'Low', 'Close']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
         # Cache and return
-        CACHE[key] = (now, df)
+        if cache is not None:
+            with _CACHE_LOCK:
+                cache[symbol] = df
+        _disk_cache_put(symbol, function, df)
         log.info(f"Successfully fetched {len(df)} rows for {symbol} {function}")
         return df
         
     except Exception as e:
         log.exception(f"Error fetching {symbol} {function}: {e}")
+        _neg_mark(key)
         return None
 
-def _ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
-
-def _atr(df: pd.DataFrame, length: int = 14) -> Optional[pd.Series]:
+def _compute_for_symbol(symbol: str, dfs: Dict[str, Optional[pd.DataFrame]]) -> Dict[str, Any]:
+    """Run the trend analysis for one symbol over pre-fetched frames"""
     try:
-        high = df["High"]
-        low = df["Low"]
-        close = df["Close"]
-        tr1 = high - low
-        tr2 = (high - close.shift(1)).abs()
-        tr3 = (low - close.shift(1)).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=length, min_periods=1).mean()
-        return atr
-    except Exception:
-        return None
-
-def _detect_structure(df: pd.DataFrame, lookback: int = 10) -> str:
-    try:
-        if df is None or df.empty or len(df) < 6:
-            return "UNKNOWN"
-        
-        highs = df["High"].dropna().tail(lookback)
-        lows = df["Low"].dropna().tail(lookback)
-        
-        if len(highs) < 3 or len(lows) < 3:
-            return "UNKNOWN"
-        
-        hi_idx = np.arange(len(highs))
-        lo_idx = np.arange(len(lows))
-        hi_slope = np.polyfit(hi_idx, highs.values, 1)[0]
-        lo_slope = np.polyfit(lo_idx, lows.values, 1)[0]
-        
-        if hi_slope > 0 and lo_slope > 0:
-            return "HH_HL"
-        if hi_slope < 0 and lo_slope < 0:
-            return "LH_LL"
-        
-        return "RANGE"
-    except Exception:
-        return "UNKNOWN"
-
-def _detect_bos(df: pd.DataFrame) -> str:
-    try:
-        if df is None or df.empty or len(df) < 6:
-            return ""
-        
-        highs = df["High"].dropna()
-        lows = df["Low"].dropna()
-        h_vals = highs.values
-        l_vals = lows.values
-        
-        local_maxima = []
-        for i in range(1, min(len(h_vals)-1, 200)):
-            if h_vals[i] > h_vals[i-1] and h_vals[i] > h_vals[i+1]:
-                local_maxima.append((i, h_vals[i]))
-        
-        local_minima = []
-        for i in range(1, min(len(l_vals)-1, 200)):
-            if l_vals[i] < l_vals[i-1] and l_vals[i] < l_vals[i+1]:
-                local_minima.append((i, l_vals[i]))
-        
-        if len(local_maxima) >= 2:
-            _, prev_val = local_maxima[-2]
-            k, last_val = local_maxima[-1]
-            if last_val > prev_val and (len(h_vals) - k) <= 8:
-                return " (BOS_up)"
-        
-        if len(local_minima) >= 2:
-            _, prev_val = local_minima[-2]
-            k, last_val = local_minima[-1]
-            if last_val < prev_val and (len(l_vals) - k) <= 8:
-                return " (BOS_down)"
-        
-        return ""
-    except Exception:
-        return ""
-
-def _compose_label(trend_label: Optional[str], structure_label: str, bos_label: str) -> str:
-    base = trend_label or "No Trend"
-    struct = f" ({structure_label})" if structure_label and structure_label not in ["UNKNOWN", "RANGE"] else (f" ({structure_label})" if structure_label == "RANGE" else "")
-    return base + struct + (bos_label or "")
-
-def _is_strong(trend_pct: float, atr: Optional[float], price: Optional[float]) -> bool:
-    try:
-        if price is None or price == 0:
-            return False
-        base_thresh = 0.008
-        if atr and atr > 0:
-            rel_atr = atr / price
-            if rel_atr < 0.002:
-                base_thresh *= 0.8
-            elif rel_atr > 0.02:
-                base_thresh *= 1.25
-        return abs(trend_pct) >= base_thresh
-    except Exception:
-        return False
-
-def _analyze_tf(df: pd.DataFrame, tf: str) -> Dict[str, Any]:
-    out = {
-        "trend_label": None,
-        "structure": "UNKNOWN",
-        "bos": "",
-        "atr": None,
-        "price": None,
-        "label": "No Data"
-    }
-    
-    if df is None or df.empty:
-        return out
-    
-    try:
-        close = df["Close"].dropna()
-        if close.empty:
-            return out
-        
-        price = float(close.iloc[-1])
-        out["price"] = price
-        
-        atr_ser = _atr(df, length=14)
-        atr_val = float(atr_ser.iloc[-1]) if atr_ser is not None and not atr_ser.empty else None
-        out["atr"] = atr_val
-        
-        # Use 200 EMA for both Weekly and Daily
-        ema_period = 200
-        
-        ema_series = _ema(close, ema_period)
-        if ema_series is None or ema_series.empty:
-            return out
-        ema_val = float(ema_series.iloc[-1])
-        
-        trend_pct = (price - ema_val) / (ema_val if ema_val != 0 else price)
-        strong_flag = _is_strong(trend_pct, atr_val, price)
-        
-        if trend_pct > 0:
-            lbl = "Bullish"
-        elif trend_pct < 0:
-            lbl = "Bearish"
-        else:
-            lbl = "Neutral"
-        
-        if strong_flag:
-            trend_label = "Strong " + lbl if lbl != "Neutral" else "Neutral"
-        else:
-            trend_label = lbl
-        
-        structure = _detect_structure(df, lookback=12)
-        bos = _detect_bos(df)
-        label = _compose_label(trend_label, structure, bos)
-        
-        out.update({
-            "trend_label": trend_label,
-            "structure": structure,
-            "bos": bos,
-            "label": label
-        })
-        
-        return out
-        
-    except Exception:
-        log.exception("Error analyzing timeframe")
-        return out
-
-def _compute_for_symbol(symbol: str) -> Dict[str, Any]:
-    try:
-        dfs = {}
-        
-        # Fetch timeframes (only Daily and Weekly available)
-        for tf, settings in TF_SETTINGS.items():
-            df = _fetch_alphavantage(symbol, settings["function"])
-            dfs[tf] = df
-        
         results = {}
         details = {}
         
         # Analyze available timeframes
-        for tf in TF_SETTINGS.keys():
+        for tf, settings in TF_SETTINGS.items():
             df = dfs.get(tf)
-            analysis = _analyze_tf(df, tf)
+            analysis = analyze_tf(df, tf, ema_period=settings["ema_period"])
             label = analysis.get("label") or "No Data"
             results[tf] = label
             details[tf] = analysis
@@ -353,30 +336,24 @@ def _compute_for_symbol(symbol: str) -> Dict[str, Any]:
         details["H4"] = {"label": "Not Available"}
         details["H1"] = {"label": "Not Available"}
         
-        # Calculate confluence from available timeframes only
-        dir_flags = []
-        for tf in ["Weekly", "Daily"]:  # Only use these for confluence
-            d = details.get(tf, {})
-            tl = (d.get("trend_label") or "").lower()
-            if "bull" in tl:
-                dir_flags.append("bull")
-            elif "bear" in tl:
-                dir_flags.append("bear")
-            else:
-                dir_flags.append("neutral")
-        
-        bulls = sum(1 for x in dir_flags if x == "bull")
-        bears = sum(1 for x in dir_flags if x == "bear")
-        neutrals = sum(1 for x in dir_flags if x == "neutral")
-        total = len(dir_flags) if dir_flags else 1
-        
-        if bulls > bears and bulls > neutrals:
-            percent = round((bulls / total) * 100)
-        elif bears > bulls and bears > neutrals:
-            percent = round((bears / total) * 100)
-        else:
-            percent = round((max(bulls, bears, neutrals) / total) * 100)
-        
+        # Calculate confluence from available timeframes only, straight
+        # from the int trend codes (no-data counts as neutral)
+        codes = np.fromiter(
+            (details.get(tf, {}).get("trend_code") or 0
+             for tf in ["Weekly", "Daily"]),
+            dtype=np.uint8
+        )
+        # Codes are ordered (0 neutral, 1-2 bull, 3-4 bear) so each camp
+        # is a single range compare
+        bulls = int(((codes >= 1) & (codes <= 2)).sum())
+        bears = int((codes >= 3).sum())
+        neutrals = int(codes.size) - bulls - bears
+        total = int(codes.size) if codes.size else 1
+
+        # Every branch of the old if-ladder reduced to the same thing:
+        # the share of the largest camp
+        percent = round((max(bulls, bears, neutrals) / total) * 100)
+
         summary = f"{percent}% confluence" if percent > 0 else "No Confluence"
         
         return {
@@ -399,12 +376,28 @@ def _compute_for_symbol(symbol: str) -> Dict[str, Any]:
 
 def get_confluence() -> List[Dict[str, Any]]:
     log.info("Starting confluence fetch - this will take ~3-4 minutes due to rate limiting")
+
+    # Prefetch every (symbol, timeframe) frame through one shared pool so
+    # cache hits and network waits overlap across all pairs; the rate
+    # limiter still paces the actual API hits
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        futures = {
+            ex.submit(_fetch_alphavantage, symbol, function,
+                      from_sym, to_sym): (symbol, tf)
+            for symbol, tf, function, from_sym, to_sym in _FETCH_PLAN
+        }
+        frames = {}
+        for future in as_completed(futures):
+            frames[futures[future]] = future.result()
+
+    timeframes = tuple(TF_SETTINGS)
     out = []
     for p in PAIRS:
-        sym = p["Symbol"]
-        pair_label = p["Pair"]
+        sym = p.symbol
+        pair_label = p.pair
         log.info(f"Starting confluence for {pair_label} ({sym})")
-        res = _compute_for_symbol(sym)
+        dfs = {tf: frames.get((sym, tf)) for tf in timeframes}
+        res = _compute_for_symbol(sym, dfs)
         res["Pair"] = pair_label
         out.append(res)
     log.info(f"Completed fetching {len(out)} pairs")
@@ -0,0 +1,231 @@
+"""
+backend/indicators.py - Shared indicator / trend analysis helpers
+
+Provider-agnostic numeric logic (EMA, ATR, structure, BOS, labeling)
+split out of the fetcher module so any data source can reuse it and all
+callers share a single analysis cache.
+"""
+
+import logging
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger("indicators")
+
+# Memoize analysis results keyed by a cheap DataFrame fingerprint so warm
+# calls (same cached frame, repeated requests) skip the numeric work
+_ANALYZE_CACHE: Dict[Tuple, Dict[str, Any]] = {}
+_ANALYZE_CACHE_MAX = 256
+
+# Smoothing factors per span, filled on first use so callers with custom
+# periods don't recompute 2/(n+1) on every call
+_ALPHAS: Dict[int, float] = {}
+
+# Geometric decay vectors keyed by (span, tail length) - the same spans
+# and frame lengths recur across every pair and refresh, so build each
+# vector once and reuse it for the BLAS dot product
+_EMA_WEIGHTS: Dict[Tuple[int, int], np.ndarray] = {}
+
+def _ema_weights(span: int, size: int, alpha: float) -> np.ndarray:
+    key = (span, size)
+    w = _EMA_WEIGHTS.get(key)
+    if w is None:
+        w = (1.0 - alpha) ** np.arange(size - 1, -1, -1)
+        w[1:] *= alpha
+        w = _EMA_WEIGHTS.setdefault(key, np.ascontiguousarray(w))
+    return w
+
+def _ema_last(arr: np.ndarray, span: int) -> float:
+    """Last value of an adjust=False EMA over a raw array.
+
+    Only the last value is ever consumed, so run the recurrence over a
+    convergence tail instead of materializing pandas' full ewm output;
+    beyond ~4 spans the older samples contribute nothing measurable.
+    """
+    alpha = _ALPHAS.get(span)
+    if alpha is None:
+        alpha = _ALPHAS.setdefault(span, 2.0 / (span + 1))
+    # float32 halves the memory traffic and is far more precision than the
+    # ~1% classification thresholds downstream ever resolve
+    tail = np.asarray(arr[-max(span * 4, 60):], dtype=np.float32)
+    # The adjust=False EMA at the last position is a dot product with a
+    # geometric decay vector, which BLAS evaluates in one vectorized pass
+    # instead of a Python-level recurrence
+    return float(np.dot(_ema_weights(span, tail.size, alpha), tail))
+
+def _atr_last(df: pd.DataFrame, length: int = 14) -> Optional[float]:
+    """Last value of a rolling-mean ATR.
+
+    Only the final ATR is ever consumed, so compute it in O(window) from
+    the tail of the frame instead of materializing a full true-range
+    series and rolling mean over every row.
+    """
+    if df is None or df.empty:
+        return None
+    n = min(len(df), length + 1)
+    high = df["High"].to_numpy()[-n:]
+    low = df["Low"].to_numpy()[-n:]
+    close = df["Close"].to_numpy()[-n:]
+    tr = np.maximum(high[1:] - low[1:],
+                    np.maximum(np.abs(high[1:] - close[:-1]),
+                               np.abs(low[1:] - close[:-1])))
+    if len(df) <= length:
+        # Short frames: the rolling window reaches the first bar, whose
+        # true range has no previous close and falls back to high - low
+        tr = np.concatenate(([high[0] - low[0]], tr))
+    return float(tr.mean())
+
+def _detect_structure(highs: np.ndarray, lows: np.ndarray, lookback: int = 10) -> str:
+    if highs.size < 6 or lows.size < 6:
+        return "UNKNOWN"
+
+    highs = highs[-lookback:]
+    lows = lows[-lookback:]
+
+    if len(highs) < 3 or len(lows) < 3:
+        return "UNKNOWN"
+
+    hi_slope = np.polyfit(np.arange(len(highs)), highs, 1)[0]
+    lo_slope = np.polyfit(np.arange(len(lows)), lows, 1)[0]
+
+    if hi_slope > 0 and lo_slope > 0:
+        return "HH_HL"
+    if hi_slope < 0 and lo_slope < 0:
+        return "LH_LL"
+
+    return "RANGE"
+
+def _detect_bos(h_vals: np.ndarray, l_vals: np.ndarray) -> str:
+    if h_vals.size < 6 or l_vals.size < 6:
+        return ""
+
+    # Find local extrema with one strided comparison over the scan window
+    # and only look at the last two peak indices - no Python-level loop
+    m = min(len(h_vals) - 1, 200)
+    peaks = np.flatnonzero(
+        (h_vals[1:m] > h_vals[:m-1]) & (h_vals[1:m] > h_vals[2:m+1])) + 1
+    if peaks.size >= 2:
+        k = int(peaks[-1])
+        if h_vals[k] > h_vals[peaks[-2]] and (len(h_vals) - k) <= 8:
+            return " (BOS_up)"
+
+    m = min(len(l_vals) - 1, 200)
+    troughs = np.flatnonzero(
+        (l_vals[1:m] < l_vals[:m-1]) & (l_vals[1:m] < l_vals[2:m+1])) + 1
+    if troughs.size >= 2:
+        k = int(troughs[-1])
+        if l_vals[k] < l_vals[troughs[-2]] and (len(l_vals) - k) <= 8:
+            return " (BOS_down)"
+
+    return ""
+
+def _compose_label(trend_label: Optional[str], structure_label: str, bos_label: str) -> str:
+    base = trend_label or "No Trend"
+    struct = f" ({structure_label})" if structure_label and structure_label not in ["UNKNOWN", "RANGE"] else (f" ({structure_label})" if structure_label == "RANGE" else "")
+    return base + struct + (bos_label or "")
+
+def _is_strong(trend_pct: float, atr: Optional[float], price: Optional[float]) -> bool:
+    if price is None or price == 0:
+        return False
+    base_thresh = 0.008
+    if atr and atr > 0:
+        rel_atr = atr / price
+        if rel_atr < 0.002:
+            base_thresh *= 0.8
+        elif rel_atr > 0.02:
+            base_thresh *= 1.25
+    return abs(trend_pct) >= base_thresh
+
+# Trend classification works on int codes; strings are resolved only at
+# the output boundary
+_TREND_LABELS = ("Neutral", "Bullish", "Strong Bullish", "Bearish", "Strong Bearish")
+_TREND_DIRECTIONS = ("neutral", "bull", "bull", "bear", "bear")
+
+def _classify_trend(trend_pct: float, strong: bool) -> int:
+    """Map (EMA distance, strength flag) to an index into _TREND_LABELS.
+
+    Branchless: sign picks the base code (bull=1, bear=3) and the strength
+    flag bumps it by one, so near-zero trend_pct values don't thrash the
+    branch predictor the way the old if-ladder did.
+    """
+    base = (trend_pct > 0) + 3 * (trend_pct < 0)
+    return int(base + (strong and base != 0))
+
+def _fingerprint(df: pd.DataFrame, tf: str) -> Tuple:
+    """Cheap identity for a price frame: timeframe, length and last bar"""
+    return (tf, len(df), df.index[-1], float(df["Close"].iloc[-1]))
+
+def analyze_tf(df: pd.DataFrame, tf: str, ema_period: int = 200) -> Dict[str, Any]:
+    out = {
+        "trend_label": None,
+        "trend_code": None,
+        "direction": "neutral",
+        "structure": "UNKNOWN",
+        "bos": "",
+        "atr": None,
+        "price": None,
+        "label": "No Data"
+    }
+
+    if df is None or df.empty:
+        return out
+
+    try:
+        cache_key = _fingerprint(df, tf)
+        cached = _ANALYZE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Pull all three price columns out of pandas once; the helpers
+        # below work on the raw arrays
+        close = df["Close"].to_numpy()
+        highs = df["High"].to_numpy()
+        lows = df["Low"].to_numpy()
+        close = close[~np.isnan(close)]
+        highs = highs[~np.isnan(highs)]
+        lows = lows[~np.isnan(lows)]
+        if close.size == 0:
+            return out
+
+        price = float(close[-1])
+        out["price"] = price
+
+        # A 200-period EMA over a handful of bars is noise, not a trend -
+        # check the length up front instead of computing and discarding
+        if close.size < max(10, ema_period // 2):
+            return out
+
+        atr_val = _atr_last(df, length=14)
+        out["atr"] = atr_val
+
+        ema_val = _ema_last(close, ema_period)
+
+        trend_pct = (price - ema_val) / (ema_val if ema_val != 0 else price)
+        strong_flag = _is_strong(trend_pct, atr_val, price)
+        trend_code = _classify_trend(trend_pct, strong_flag)
+        trend_label = _TREND_LABELS[trend_code]
+
+        structure = _detect_structure(highs, lows, lookback=12)
+        bos = _detect_bos(highs, lows)
+        label = _compose_label(trend_label, structure, bos)
+
+        out.update({
+            "trend_label": trend_label,
+            "trend_code": trend_code,
+            "direction": _TREND_DIRECTIONS[trend_code],
+            "structure": structure,
+            "bos": bos,
+            "label": label
+        })
+
+        if len(_ANALYZE_CACHE) >= _ANALYZE_CACHE_MAX:
+            _ANALYZE_CACHE.clear()
+        _ANALYZE_CACHE[cache_key] = out
+
+        return out
+
+    except Exception:
+        log.exception("Error analyzing timeframe")
+        return out